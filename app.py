@@ -4,13 +4,34 @@
 from __future__ import annotations
 
 import argparse
+import functools
 import json
-from dataclasses import asdict, dataclass
+import mmap
+import os
+import struct
+from dataclasses import dataclass
 from pathlib import Path
-from typing import List
+from typing import Iterator, List
+
+try:
+    import orjson
+except ImportError:  # orjson необязателен: без него работает стандартный json
+    orjson = None
 
 DEFAULT_DB_PATH = Path(".codex_demo_tasks.json")
 
+# Бинарный формат: MAGIC, заголовок <next_id:i64>, затем записи
+# <id:i64><done:u8><len:u32> + текст в UTF-8.
+MAGIC = b"T3"
+HEADER = struct.Struct("<q")
+RECORD = struct.Struct("<qBI")
+RECORDS_OFFSET = len(MAGIC) + HEADER.size
+DONE_OFFSET = 8  # смещение байта done внутри заголовка записи
+
+# Прежние версии: id в u32; T1 без заголовка, T2 с заголовком <next_id:u32>.
+RECORD_V2 = struct.Struct("<IBI")
+LEGACY_RECORDS_OFFSETS = {b"T1": 2, b"T2": 6}
+
 
 @dataclass
 class Task:
@@ -19,32 +40,150 @@ class Task:
     done: bool = False
 
 
-def load_tasks(db_path: Path) -> List[Task]:
-    if not db_path.exists():
-        return []
+def pack_task(task: Task) -> bytes:
+    text = task.text.encode("utf-8")
+    try:
+        header = RECORD.pack(task.id, task.done, len(text))
+    except struct.error as exc:
+        raise ValueError(f"ID задачи вне диапазона int64: {task.id}") from exc
+    return header + text
 
-    raw = json.loads(db_path.read_text(encoding="utf-8"))
-    return [Task(**item) for item in raw]
 
+def pack_tasks(tasks: List[Task]) -> bytes:
+    next_id = max((task.id for task in tasks), default=0) + 1
+    return MAGIC + HEADER.pack(next_id) + b"".join(pack_task(task) for task in tasks)
+
+
+def scan_records(
+    data: bytes | mmap.mmap, offset: int, record: struct.Struct = RECORD
+) -> Iterator[tuple[int, int, int, bool]]:
+    """Возвращает (id, смещение текста, длина текста, done) для каждой записи."""
+    while offset < len(data):
+        task_id, done, size = record.unpack_from(data, offset)
+        offset += record.size
+        yield task_id, offset, size, bool(done)
+        offset += size
+
+
+class TaskTape:
+    """Задачи из бинарной базы без разбора текстов: Task создаётся только при обращении."""
+
+    def __init__(self, data: bytes | mmap.mmap, legacy: bool = False) -> None:
+        self._data = data
+        self.legacy = legacy
+        self.next_id: int = HEADER.unpack_from(data, len(MAGIC))[0]
+        self._dirty: list[int] = []
+
+    # Записи разбираются только при первом обращении: add читает один заголовок.
+    @functools.cached_property
+    def _records(self) -> list[tuple[int, int, int, bool]]:
+        return list(scan_records(self._data, RECORDS_OFFSET))
+
+    @functools.cached_property
+    def _index(self) -> dict[int, int]:
+        return {record[0]: index for index, record in enumerate(self._records)}
+
+    @classmethod
+    def open(cls, db_path: Path) -> TaskTape:
+        if not db_path.exists():
+            return cls(pack_tasks([]))
+
+        with db_path.open("rb") as fh:
+            if fh.read(len(MAGIC)) == MAGIC:
+                return cls(mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ))
+
+        # Старые базы (JSON, T1, T2) читаются целиком и при следующем сохранении переписываются.
+        data = db_path.read_bytes()
+        start = LEGACY_RECORDS_OFFSETS.get(data[: len(MAGIC)])
+        if start is not None:
+            tasks = [
+                Task(task_id, data[offset : offset + size].decode("utf-8"), done)
+                for task_id, offset, size, done in scan_records(data, start, RECORD_V2)
+            ]
+        else:
+            raw = orjson.loads(data) if orjson is not None else json.loads(data.decode("utf-8"))
+            tasks = [Task(**item) for item in raw]
+        return cls(pack_tasks(tasks), legacy=True)
+
+    def __enter__(self) -> TaskTape:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if isinstance(self._data, mmap.mmap):
+            self._data.close()
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def __iter__(self) -> Iterator[Task]:
+        return (self._materialize(record) for record in self._records)
+
+    def _materialize(self, record: tuple[int, int, int, bool]) -> Task:
+        task_id, offset, size, done = record
+        return Task(task_id, self._data[offset : offset + size].decode("utf-8"), done)
+
+    def done_count(self) -> int:
+        return sum(record[3] for record in self._records)
+
+    def mark_done(self, task_id: int) -> Task | None:
+        index = self._index.get(task_id)
+        if index is None:
+            return None
+        self._records[index] = record = (*self._records[index][:3], True)
+        self._dirty.append(record[1] - RECORD.size + DONE_OFFSET)
+        return self._materialize(record)
+
+    def flush(self, db_path: Path) -> None:
+        if self.legacy:
+            save_tasks(list(self), db_path)
+        elif self._dirty:
+            # Отметка выполнения меняет один байт записи — файл не переписывается целиком.
+            with db_path.open("r+b") as fh:
+                for offset in self._dirty:
+                    fh.seek(offset)
+                    fh.write(b"\x01")
+        self._dirty.clear()
 
-def save_tasks(tasks: List[Task], db_path: Path) -> None:
-    payload = [asdict(task) for task in tasks]
-    db_path.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
 
+def load_tasks(db_path: Path) -> List[Task]:
+    with TaskTape.open(db_path) as tape:
+        return list(tape)
 
-def add_task(tasks: List[Task], text: str) -> Task:
-    next_id = max((task.id for task in tasks), default=0) + 1
-    task = Task(id=next_id, text=text)
-    tasks.append(task)
-    return task
 
+def save_tasks(tasks: List[Task], db_path: Path) -> None:
+    db_path.write_bytes(pack_tasks(tasks))
 
-def mark_done(tasks: List[Task], task_id: int) -> Task | None:
-    for task in tasks:
-        if task.id == task_id:
-            task.done = True
-            return task
-    return None
+
+def append_task(task: Task, db_path: Path) -> None:
+    if not db_path.exists():
+        save_tasks([task], db_path)
+        return
+
+    # Записи самодостаточны: дописываем одну в конец. Заголовок обновляется первым —
+    # при сбое между записями id будет пропущен, но не выдан повторно.
+    record = pack_task(task)
+    with db_path.open("r+b") as fh:
+        fh.seek(len(MAGIC))
+        (next_id,) = HEADER.unpack(fh.read(HEADER.size))
+        fh.seek(len(MAGIC))
+        fh.write(HEADER.pack(max(next_id, task.id + 1)))
+        fh.seek(0, os.SEEK_END)
+        fh.write(record)
+
+
+def add_task(tape: TaskTape, text: str, db_path: Path) -> Task:
+    task = Task(id=tape.next_id, text=text)
+    if tape.legacy:
+        # Старая база переписывается целиком в новом формате; дальше можно дописывать.
+        save_tasks([*tape, task], db_path)
+        tape.legacy = False
+    else:
+        append_task(task, db_path)
+    tape.next_id += 1
+    return task
 
 
 def format_task(task: Task) -> str:
@@ -61,7 +200,7 @@ def build_parser() -> argparse.ArgumentParser:
         "--db",
         type=Path,
         default=DEFAULT_DB_PATH,
-        help="путь до JSON-файла с задачами (по умолчанию: ./.codex_demo_tasks.json)",
+        help="путь до файла с задачами (по умолчанию: ./.codex_demo_tasks.json)",
     )
 
     subparsers = parser.add_subparsers(dest="command", required=True)
@@ -81,34 +220,36 @@ def build_parser() -> argparse.ArgumentParser:
 def main() -> int:
     parser = build_parser()
     args = parser.parse_args()
-    tasks = load_tasks(args.db)
+    with TaskTape.open(args.db) as tape:
+        return run_command(parser, args, tape)
+
 
+def run_command(parser: argparse.ArgumentParser, args: argparse.Namespace, tape: TaskTape) -> int:
     if args.command == "add":
-        task = add_task(tasks, args.text)
-        save_tasks(tasks, args.db)
+        task = add_task(tape, args.text, args.db)
         print(f"Добавлено: {format_task(task)}")
         return 0
 
     if args.command == "list":
-        if not tasks:
+        if not len(tape):
             print("Список задач пуст. Добавь первую задачу командой add.")
             return 0
-        for task in tasks:
+        for task in tape:
             print(format_task(task))
         return 0
 
     if args.command == "done":
-        task = mark_done(tasks, args.task_id)
+        task = tape.mark_done(args.task_id)
         if task is None:
             print(f"Задача с ID={args.task_id} не найдена.")
             return 1
-        save_tasks(tasks, args.db)
+        tape.flush(args.db)
         print(f"Готово: {format_task(task)}")
         return 0
 
     if args.command == "stats":
-        total = len(tasks)
-        done = sum(task.done for task in tasks)
+        total = len(tape)
+        done = tape.done_count()
         pending = total - done
         print(f"Всего: {total} | Выполнено: {done} | В работе: {pending}")
         return 0
@@ -4,52 +4,186 @@
 from __future__ import annotations
 
 import curses
+import errno
+import functools
+import os
 import shutil
 import stat
 import subprocess
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
-from datetime import datetime
 from pathlib import Path
 
 
+@dataclass(frozen=True)
+class ParentEntry:
+    """Stand-in for the ``..`` row, duck-typed like ``os.DirEntry``."""
+
+    path: str
+    name: str = ".."
+
+    def is_dir(self, *, follow_symlinks: bool = True) -> bool:
+        return True
+
+    def stat(self, *, follow_symlinks: bool = True) -> os.stat_result:
+        return os.stat(self.path, follow_symlinks=follow_symlinks)
+
+
+Entry = os.DirEntry | ParentEntry
+DirCache = OrderedDict[Path, tuple[int, list[os.DirEntry]]]
+
+DIR_CACHE_SIZE = 64
+
+# Only a few hundred distinct modes show up in practice, so memoize the formatter.
+_filemode = functools.lru_cache(maxsize=1024)(stat.filemode)
+
+# copy_file_range errors that mean "not supported here" rather than a real I/O failure.
+_NO_COPY_RANGE = {errno.EXDEV, errno.ENOSYS, errno.EINVAL, errno.EOPNOTSUPP, errno.ETXTBSY}
+_COPY_BLOCK = 1 << 30
+COPY_WORKERS = 8
+
+
 @dataclass
 class PaneState:
     path: Path
     cursor: int = 0
-    entries: list[Path] = field(default_factory=list)
+    entries: list[Entry] = field(default_factory=list)
+    cache: DirCache | None = field(default=None, repr=False)
+    _shown: tuple[Path, int] | None = field(default=None, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self.set_path(self.path)
+
+    def set_path(self, path: Path) -> None:
+        # Resolve once here so refresh() does not walk and readlink every ancestor.
+        self.path = path.expanduser().resolve()
 
     def refresh(self) -> None:
-        self.path = self.path.expanduser().resolve()
-        items = list(self.path.iterdir())
-        self.entries = sorted(items, key=lambda p: (p.is_file(), p.name.lower()))
-        self.entries.insert(0, self.path.parent)
+        # A directory's mtime changes whenever an entry is added, removed or renamed.
+        mtime_ns = os.stat(self.path).st_mtime_ns
+        if self._shown == (self.path, mtime_ns):
+            return
+        self.entries = [ParentEntry(str(self.path.parent)), *self._listing(mtime_ns)]
+        self._shown = (self.path, mtime_ns)
         if self.cursor >= len(self.entries):
             self.cursor = max(0, len(self.entries) - 1)
 
+    def invalidate(self) -> None:
+        self._shown = None
+
+    def _listing(self, mtime_ns: int) -> list[os.DirEntry]:
+        if self.cache is not None:
+            cached = self.cache.get(self.path)
+            if cached is not None and cached[0] == mtime_ns:
+                self.cache.move_to_end(self.path)
+                return cached[1]
+
+        with os.scandir(self.path) as it:
+            items = sorted(it, key=lambda e: (not e.is_dir(), e.name.lower()))
+        if self.cache is not None:
+            self.cache[self.path] = (mtime_ns, items)
+            self.cache.move_to_end(self.path)
+            if len(self.cache) > DIR_CACHE_SIZE:
+                self.cache.popitem(last=False)
+        return items
+
     def selected(self) -> Path:
         if not self.entries:
             return self.path
-        return self.entries[self.cursor]
+        return Path(self.entries[self.cursor].path)
 
 
-def format_entry(path: Path) -> str:
-    if path == path.parent:
+def format_entry(entry: Entry) -> str:
+    if isinstance(entry, ParentEntry):
         return "[..]"
 
-    name = path.name + ("/" if path.is_dir() else "")
+    is_dir = entry.is_dir()
     try:
-        info = path.stat()
-        if path.is_dir():
-            size = "<DIR>"
-        else:
-            size = f"{info.st_size:>8}"
-        mtime = datetime.fromtimestamp(info.st_mtime).strftime("%Y-%m-%d %H:%M")
-        mode = stat.filemode(info.st_mode)
+        info = entry.stat()
     except OSError:
-        size = "?"
-        mtime = "?"
-        mode = "??????????"
-    return f"{mode} {size:>8} {mtime} {name}"
+        return f"?????????? {'?':>8} ? {entry.name}{'/' if is_dir else ''}"
+    return _format_cached(info.st_mode, info.st_size, info.st_mtime_ns, entry.name, is_dir)
+
+
+@functools.lru_cache(maxsize=4096)
+def _format_cached(mode: int, size: int, mtime_ns: int, name: str, is_dir: bool) -> str:
+    lt = time.localtime(mtime_ns // 1_000_000_000)
+    mtime = f"{lt.tm_year:04d}-{lt.tm_mon:02d}-{lt.tm_mday:02d} {lt.tm_hour:02d}:{lt.tm_min:02d}"
+    size_text = "<DIR>" if is_dir else f"{size:>8}"
+    name_text = name + ("/" if is_dir else "")
+    return f"{_filemode(mode)} {size_text:>8} {mtime} {name_text}"
+
+
+def _copy_file_range(src: Path, dst: Path) -> bool:
+    with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+        in_fd, out_fd = fsrc.fileno(), fdst.fileno()
+        copied = 0
+        try:
+            while n := os.copy_file_range(in_fd, out_fd, _COPY_BLOCK):
+                copied += n
+        except OSError as exc:
+            if exc.errno not in _NO_COPY_RANGE:
+                raise
+            return False
+        # Pseudo-files (procfs, sysfs) may report size 0 yet have content that
+        # copy_file_range cannot see; let copy2 handle anything that copied nothing.
+        return copied > 0
+
+
+def _copy_file(src: Path, dst: Path) -> None:
+    """Copy with copy_file_range (in-kernel, COW where supported), else shutil.copy2 (sendfile)."""
+    # Only regular files: opening a FIFO would block, and copy2 rejects it with SpecialFileError.
+    regular = stat.S_ISREG(os.stat(src).st_mode)
+    if regular and hasattr(os, "copy_file_range") and _copy_file_range(src, dst):
+        shutil.copystat(src, dst)
+    else:
+        shutil.copy2(src, dst)
+
+
+def _copy_tree(src: Path, dst: Path, workers: int = COPY_WORKERS) -> None:
+    # Like shutil.copytree: failures below the top directory are collected, the rest
+    # of the tree is still copied, and one shutil.Error is raised at the end.
+    errors: list[tuple[str, str, str]] = []
+    # Create the directory skeleton first so file copies can run in any order.
+    dirs: list[tuple[Path, Path]] = []
+    files: list[tuple[Path, Path]] = []
+    pending = [(src, dst)]
+    while pending:
+        src_dir, dst_dir = pending.pop()
+        try:
+            # List the source before creating the destination: dst may live inside src.
+            with os.scandir(src_dir) as it:
+                entries = list(it)
+            dst_dir.mkdir()
+        except OSError as exc:
+            if src_dir == src:
+                raise
+            errors.append((str(src_dir), str(dst_dir), str(exc)))
+            continue
+        dirs.append((src_dir, dst_dir))
+        for entry in entries:
+            pair = (Path(entry.path), dst_dir / entry.name)
+            (pending if entry.is_dir() else files).append(pair)
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = [(pair, pool.submit(_copy_file, *pair)) for pair in files]
+        for (src_file, dst_file), future in futures:
+            try:
+                future.result()
+            except OSError as exc:
+                errors.append((str(src_file), str(dst_file), str(exc)))
+
+    # Directory times are set last, after the files inside them stop changing.
+    for src_dir, dst_dir in reversed(dirs):
+        try:
+            shutil.copystat(src_dir, dst_dir)
+        except OSError as exc:
+            errors.append((str(src_dir), str(dst_dir), str(exc)))
+
+    if errors:
+        raise shutil.Error(errors)
 
 
 def copy_or_move(src: Path, dst_dir: Path, move: bool = False) -> Path:
@@ -58,19 +192,29 @@ def copy_or_move(src: Path, dst_dir: Path, move: bool = False) -> Path:
         raise FileExistsError(f"Destination already exists: {dst}")
 
     if move:
-        shutil.move(str(src), str(dst))
+        try:
+            os.rename(src, dst)
+        except OSError as exc:
+            if exc.errno != errno.EXDEV:
+                raise
+            shutil.move(str(src), str(dst))
     elif src.is_dir():
-        shutil.copytree(src, dst)
+        _copy_tree(src, dst)
     else:
-        shutil.copy2(src, dst)
+        _copy_file(src, dst)
     return dst
 
 
 class FileManager:
     def __init__(self, left: Path, right: Path) -> None:
-        self.panes = [PaneState(left), PaneState(right)]
+        self._dir_cache: DirCache = OrderedDict()
+        self.panes = [PaneState(left, cache=self._dir_cache), PaneState(right, cache=self._dir_cache)]
         self.active = 0
         self.status = "Tab переключает панель | Enter открыть | F5 копировать | F6 переместить | F8 удалить | q выход"
+        self._windows: list[curses.window] = []
+        self._shadow: list[list[tuple[str, int]]] = [[], []]
+        self._status_win: curses.window | None = None
+        self._last_status: str | None = None
 
     def other_index(self) -> int:
         return 1 - self.active
@@ -79,6 +223,24 @@ class FileManager:
         for pane in self.panes:
             pane.refresh()
 
+    def invalidate(self, path: Path) -> None:
+        self._dir_cache.pop(path, None)
+        for pane in self.panes:
+            if pane.path == path:
+                pane.invalidate()
+
+    def layout(self, stdscr: curses.window) -> tuple[int, int, int]:
+        h, w = stdscr.getmaxyx()
+        mid = w // 2
+        self._windows = [curses.newwin(h - 1, mid, 0, 0), curses.newwin(h - 1, w - mid, 0, mid)]
+        self._shadow = [[], []]
+        self._status_win = curses.newwin(1, w, h - 1, 0)
+        self._status_win.bkgd(" ", curses.A_STANDOUT)
+        self._last_status = None
+        # stdscr stays blank underneath; stage it now so getch() never repaints it over the panes.
+        stdscr.noutrefresh()
+        return h, w, mid
+
     def prompt(self, stdscr: curses.window, text: str) -> str:
         h, w = stdscr.getmaxyx()
         curses.echo()
@@ -87,12 +249,21 @@ class FileManager:
         stdscr.refresh()
         value = stdscr.getstr(h - 1, min(len(text), w - 2), w - len(text) - 2)
         curses.noecho()
+        self._last_status = None  # the prompt was drawn over the status line
         return value.decode("utf-8", errors="ignore").strip()
 
     def open_entry(self, entry: Path) -> None:
         if entry.is_dir():
-            self.panes[self.active].path = entry.resolve()
-            self.panes[self.active].cursor = 0
+            pane = self.panes[self.active]
+            previous = (pane.path, pane.cursor)
+            pane.set_path(entry)
+            pane.cursor = 0
+            try:
+                pane.refresh()
+            except OSError:
+                # Stay in the old directory so the title matches the rows on screen.
+                pane.path, pane.cursor = previous
+                raise
             return
 
         cmd = ["xdg-open", str(entry)]
@@ -110,6 +281,7 @@ class FileManager:
             shutil.rmtree(entry)
         else:
             entry.unlink(missing_ok=True)
+        self.invalidate(entry.parent)
         self.status = f"Удалено: {entry.name}"
 
     def rename_entry(self, stdscr: curses.window, entry: Path) -> None:
@@ -122,6 +294,7 @@ class FileManager:
             return
         target = entry.with_name(new_name)
         entry.rename(target)
+        self.invalidate(entry.parent)
         self.status = f"Переименовано в {new_name}"
 
     def make_dir(self, stdscr: curses.window) -> None:
@@ -131,53 +304,80 @@ class FileManager:
             return
         target = self.panes[self.active].path / name
         target.mkdir(parents=False, exist_ok=False)
+        self.invalidate(target.parent)
         self.status = f"Создан каталог: {name}"
 
-    def draw_pane(self, stdscr: curses.window, pane: PaneState, x: int, width: int, active: bool) -> None:
-        h, _ = stdscr.getmaxyx()
-        title = f" {pane.path} "
+    def draw_pane(self, index: int, h: int, width: int, active: bool) -> None:
+        pane = self.panes[index]
+        win = self._windows[index]
         border_attr = curses.A_BOLD if active else curses.A_DIM
-        stdscr.addnstr(0, x, title.ljust(width), width, border_attr)
+        rows = [(f" {pane.path} "[:width], border_attr)]
 
-        max_lines = h - 2
+        max_lines = h - 1
         start = 0
         if pane.cursor >= max_lines:
             start = pane.cursor - max_lines + 1
 
         visible = pane.entries[start : start + max_lines]
-        for i, entry in enumerate(visible):
-            y = i + 1
-            idx = i + start
-            text = format_entry(entry)
-            attr = curses.A_REVERSE if (active and idx == pane.cursor) else curses.A_NORMAL
-            stdscr.addnstr(y, x, text.ljust(width), width, attr)
-
-        for y in range(len(visible) + 1, h - 1):
-            stdscr.addnstr(y, x, " " * width, width)
+        rows += [
+            (
+                format_entry(entry)[:width],
+                curses.A_REVERSE if (active and idx == pane.cursor) else curses.A_NORMAL,
+            )
+            for idx, entry in enumerate(visible, start)
+        ]
+        rows.extend([("", curses.A_NORMAL)] * (h - len(rows)))
+
+        shadow = self._shadow[index]
+        for y, row in enumerate(rows):
+            if y < len(shadow) and shadow[y] == row:
+                continue
+            text, attr = row
+            # clrtoeol fills with the background, so set it to keep the highlight full-width.
+            win.bkgdset(" ", attr)
+            win.move(y, 0)
+            try:
+                if text:
+                    win.addnstr(text, width)
+                if len(text) < width:
+                    win.clrtoeol()
+            except curses.error:
+                pass  # writing the bottom-right cell pushes the cursor off the window
+        win.bkgdset(" ", curses.A_NORMAL)
+        self._shadow[index] = rows
+        win.noutrefresh()
+
+    def draw_status(self, width: int) -> None:
+        if self.status == self._last_status:
+            return
+        self._status_win.erase()
+        self._status_win.addnstr(0, 0, self.status, width - 1)
+        self._status_win.noutrefresh()
+        self._last_status = self.status
 
     def run(self, stdscr: curses.window) -> None:
         curses.curs_set(0)
         stdscr.keypad(True)
         self.refresh()
+        h, w, mid = self.layout(stdscr)
 
         while True:
-            stdscr.erase()
-            h, w = stdscr.getmaxyx()
-            mid = w // 2
-
-            self.draw_pane(stdscr, self.panes[0], 0, mid, self.active == 0)
-            self.draw_pane(stdscr, self.panes[1], mid, w - mid, self.active == 1)
-            stdscr.addnstr(h - 1, 0, self.status.ljust(w - 1), w - 1, curses.A_STANDOUT)
-            stdscr.refresh()
+            self.draw_pane(0, h - 1, mid, self.active == 0)
+            self.draw_pane(1, h - 1, w - mid, self.active == 1)
+            self.draw_status(w)
+            curses.doupdate()
 
             key = stdscr.getch()
             pane = self.panes[self.active]
             entry = pane.selected()
+            dirty: set[int] = set()
 
             try:
                 if key in (ord("q"), 27):
                     return
-                if key == 9:  # Tab
+                if key == curses.KEY_RESIZE:
+                    h, w, mid = self.layout(stdscr)
+                elif key == 9:  # Tab
                     self.active = self.other_index()
                 elif key in (curses.KEY_UP, ord("k")):
                     pane.cursor = max(0, pane.cursor - 1)
@@ -186,24 +386,42 @@ class FileManager:
                 elif key in (10, 13):
                     self.open_entry(entry)
                 elif key in (curses.KEY_F5, ord("5")):
+                    dirty.add(self.other_index())
                     target = copy_or_move(entry, self.panes[self.other_index()].path, move=False)
+                    self.invalidate(target.parent)
                     self.status = f"Скопировано: {target.name}"
                 elif key in (curses.KEY_F6, ord("6")):
+                    dirty.update((0, 1))
                     target = copy_or_move(entry, self.panes[self.other_index()].path, move=True)
+                    self.invalidate(entry.parent)
+                    self.invalidate(target.parent)
                     self.status = f"Перемещено: {target.name}"
                 elif key in (curses.KEY_F8, ord("8")):
+                    dirty.add(self.active)
                     self.delete_entry(entry)
                 elif key == curses.KEY_F7:
+                    dirty.add(self.active)
                     self.make_dir(stdscr)
                 elif key == curses.KEY_F2:
+                    dirty.add(self.active)
                     self.rename_entry(stdscr, entry)
                 elif key == ord("r"):
-                    self.refresh()
+                    dirty.update((0, 1))
+                    self._dir_cache.clear()
+                    for target_pane in self.panes:
+                        target_pane.invalidate()
                     self.status = "Обновлено"
             except Exception as exc:  # noqa: BLE001
                 self.status = f"Ошибка: {exc}"
 
-            self.refresh()
+            # Both panes may show the same directory, so refresh by path.
+            dirty_paths = {self.panes[i].path for i in dirty}
+            for target_pane in self.panes:
+                if target_pane.path in dirty_paths:
+                    try:
+                        target_pane.refresh()
+                    except OSError as exc:
+                        self.status = f"Ошибка: {exc}"
 
 
 def main() -> int:
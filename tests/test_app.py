@@ -1,19 +1,40 @@
+import json
 from pathlib import Path
 
-from app import Task, add_task, load_tasks, mark_done, save_tasks
+from app import Task, TaskTape, add_task, append_task, load_tasks, save_tasks
 
 
-def test_add_task_assigns_incremental_ids() -> None:
-    tasks = [Task(id=1, text="one"), Task(id=5, text="five")]
-    created = add_task(tasks, "new")
-    assert created.id == 6
-    assert tasks[-1].text == "new"
+def test_add_task_assigns_incremental_ids(tmp_path: Path) -> None:
+    db = tmp_path / "tasks.json"
+    save_tasks([Task(id=1, text="one"), Task(id=5, text="five")], db)
+
+    with TaskTape.open(db) as tape:
+        assert add_task(tape, "new", db).id == 6
+        assert add_task(tape, "newer", db).id == 7
+        assert "_records" not in vars(tape)  # add не разбирает записи
+
+    assert [task.text for task in load_tasks(db)] == ["one", "five", "new", "newer"]
+    with TaskTape.open(db) as tape:
+        assert tape.next_id == 8
+
+
+def test_add_task_migrates_legacy_json(tmp_path: Path) -> None:
+    db = tmp_path / "tasks.json"
+    db.write_text(json.dumps([{"id": 3, "text": "old", "done": False}]), encoding="utf-8")
+
+    with TaskTape.open(db) as tape:
+        assert add_task(tape, "a", db).id == 4
+        assert add_task(tape, "b", db).id == 5
+
+    assert [task.id for task in load_tasks(db)] == [3, 4, 5]
 
 
-def test_mark_done_returns_none_for_missing_task() -> None:
-    tasks = [Task(id=1, text="one")]
-    result = mark_done(tasks, 99)
-    assert result is None
+def test_mark_done_returns_none_for_missing_task(tmp_path: Path) -> None:
+    db = tmp_path / "tasks.json"
+    save_tasks([Task(id=1, text="one")], db)
+
+    with TaskTape.open(db) as tape:
+        assert tape.mark_done(99) is None
 
 
 def test_save_and_load_roundtrip(tmp_path: Path) -> None:
@@ -23,3 +44,52 @@ def test_save_and_load_roundtrip(tmp_path: Path) -> None:
 
     loaded = load_tasks(db)
     assert loaded == source
+
+
+def test_load_reads_legacy_json(tmp_path: Path) -> None:
+    db = tmp_path / "tasks.json"
+    db.write_text(json.dumps([{"id": 1, "text": "старая", "done": True}]), encoding="utf-8")
+
+    assert load_tasks(db) == [Task(id=1, text="старая", done=True)]
+
+
+def test_tape_mark_done_updates_file_in_place(tmp_path: Path) -> None:
+    db = tmp_path / "tasks.json"
+    save_tasks([Task(id=1, text="first"), Task(id=2, text="second")], db)
+    size = db.stat().st_size
+
+    with TaskTape.open(db) as tape:
+        assert tape.mark_done(2) == Task(id=2, text="second", done=True)
+        assert tape.mark_done(7) is None
+        tape.flush(db)
+
+    assert db.stat().st_size == size
+    with TaskTape.open(db) as tape:
+        assert len(tape) == 2
+        assert tape.done_count() == 1
+
+
+def test_append_task_extends_existing_database(tmp_path: Path) -> None:
+    db = tmp_path / "tasks.json"
+    append_task(Task(id=1, text="first"), db)
+    append_task(Task(id=2, text="second", done=True), db)
+
+    assert load_tasks(db) == [Task(id=1, text="first"), Task(id=2, text="second", done=True)]
+
+
+def test_tape_reads_next_id_from_header(tmp_path: Path) -> None:
+    db = tmp_path / "tasks.json"
+    save_tasks([Task(id=3, text="three")], db)
+    append_task(Task(id=4, text="four"), db)
+
+    with TaskTape.open(db) as tape:
+        assert tape.next_id == 5
+
+
+def test_load_reads_legacy_json_with_wide_ids(tmp_path: Path) -> None:
+    db = tmp_path / "tasks.json"
+    db.write_text(json.dumps([{"id": -1, "text": "minus"}, {"id": 2**40, "text": "big"}]), encoding="utf-8")
+
+    with TaskTape.open(db) as tape:
+        assert [task.id for task in tape] == [-1, 2**40]
+        assert tape.next_id == 2**40 + 1
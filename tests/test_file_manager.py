@@ -1,8 +1,11 @@
+import os
+import shutil
+from collections import OrderedDict
 from pathlib import Path
 
 import pytest
 
-from file_manager import copy_or_move, format_entry
+from file_manager import FileManager, ParentEntry, PaneState, copy_or_move, format_entry
 
 
 def test_copy_or_move_copies_file(tmp_path: Path) -> None:
@@ -19,6 +22,75 @@ def test_copy_or_move_copies_file(tmp_path: Path) -> None:
     assert source.exists()
 
 
+def test_copy_or_move_copies_directory_tree(tmp_path: Path) -> None:
+    src_dir = tmp_path / "left"
+    dst_dir = tmp_path / "right"
+    (src_dir / "folder" / "nested").mkdir(parents=True)
+    dst_dir.mkdir()
+    (src_dir / "folder" / "nested" / "y.txt").write_text("y" * 100_000, encoding="utf-8")
+    (src_dir / "folder" / "empty.txt").write_text("", encoding="utf-8")
+
+    copied = copy_or_move(src_dir / "folder", dst_dir)
+
+    assert (copied / "nested" / "y.txt").read_text(encoding="utf-8") == "y" * 100_000
+    assert (copied / "empty.txt").read_text(encoding="utf-8") == ""
+    assert (src_dir / "folder").is_dir()
+
+
+def test_copy_or_move_copies_directory_into_itself(tmp_path: Path) -> None:
+    proj = tmp_path / "proj"
+    (proj / "sub").mkdir(parents=True)
+    (proj / "a.txt").write_text("a", encoding="utf-8")
+
+    copied = copy_or_move(proj, proj)
+
+    assert copied == proj / "proj"
+    assert sorted(path.name for path in copied.iterdir()) == ["a.txt", "sub"]
+    assert not (copied / "proj").exists()
+
+
+def test_copy_or_move_rejects_fifo(tmp_path: Path) -> None:
+    src_dir = tmp_path / "left"
+    dst_dir = tmp_path / "right"
+    src_dir.mkdir()
+    dst_dir.mkdir()
+    os.mkfifo(src_dir / "pipe")
+
+    with pytest.raises(shutil.SpecialFileError):
+        copy_or_move(src_dir / "pipe", dst_dir)
+    with pytest.raises(shutil.Error):
+        copy_or_move(src_dir, dst_dir)
+
+
+def test_copy_or_move_copies_rest_of_tree_when_subdirectory_fails(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    tree = tmp_path / "tree"
+    (tree / "ok").mkdir(parents=True)
+    (tree / "locked").mkdir()
+    (tree / "a.txt").write_text("a", encoding="utf-8")
+    (tree / "ok" / "b.txt").write_text("b", encoding="utf-8")
+    dst_dir = tmp_path / "dest"
+    dst_dir.mkdir()
+    real_scandir = os.scandir
+
+    def scandir(path: Path) -> object:
+        if Path(path).name == "locked":
+            raise PermissionError(13, "Permission denied", str(path))
+        return real_scandir(path)
+
+    monkeypatch.setattr(os, "scandir", scandir)
+
+    with pytest.raises(shutil.Error) as excinfo:
+        copy_or_move(tree, dst_dir)
+
+    [(failed_src, _, _)] = excinfo.value.args[0]
+    assert failed_src == str(tree / "locked")
+    assert (dst_dir / "tree" / "a.txt").read_text(encoding="utf-8") == "a"
+    assert (dst_dir / "tree" / "ok" / "b.txt").read_text(encoding="utf-8") == "b"
+    assert not (dst_dir / "tree" / "locked").exists()
+
+
 def test_copy_or_move_moves_directory(tmp_path: Path) -> None:
     src_dir = tmp_path / "left"
     dst_dir = tmp_path / "right"
@@ -47,5 +119,75 @@ def test_copy_or_move_raises_when_target_exists(tmp_path: Path) -> None:
 
 
 def test_format_entry_parent_marker() -> None:
-    root = Path("/")
-    assert format_entry(root) == "[..]"
+    assert format_entry(ParentEntry("/")) == "[..]"
+
+
+def test_pane_refresh_lists_dirs_first(tmp_path: Path) -> None:
+    (tmp_path / "b.txt").write_text("b", encoding="utf-8")
+    (tmp_path / "A.txt").write_text("a", encoding="utf-8")
+    (tmp_path / "zdir").mkdir()
+
+    pane = PaneState(tmp_path)
+    pane.refresh()
+
+    assert [entry.name for entry in pane.entries] == ["..", "zdir", "A.txt", "b.txt"]
+    pane.cursor = 1
+    assert pane.selected() == tmp_path / "zdir"
+    assert format_entry(pane.entries[1]).endswith(" zdir/")
+
+
+def test_pane_lists_symlinked_directory_as_directory(tmp_path: Path) -> None:
+    (tmp_path / "real").mkdir()
+    (tmp_path / "a.txt").write_text("a", encoding="utf-8")
+    (tmp_path / "alink").symlink_to(tmp_path / "real")
+
+    pane = PaneState(tmp_path)
+    pane.refresh()
+
+    assert [entry.name for entry in pane.entries] == ["..", "alink", "real", "a.txt"]
+    row = format_entry(pane.entries[1])
+    assert row.startswith("d")
+    assert "<DIR>" in row
+    assert row.endswith(" alink/")
+
+
+def test_pane_refresh_reuses_cached_listing_until_mtime_changes(tmp_path: Path) -> None:
+    (tmp_path / "a.txt").write_text("a", encoding="utf-8")
+    cache: OrderedDict = OrderedDict()
+    pane = PaneState(tmp_path, cache=cache)
+
+    pane.refresh()
+    first = cache[tmp_path][1]
+    entries = pane.entries
+    pane.refresh()
+    assert cache[tmp_path][1] is first
+    assert pane.entries is entries
+
+    (tmp_path / "b.txt").write_text("b", encoding="utf-8")
+    pane.refresh()
+    assert [entry.name for entry in pane.entries] == ["..", "a.txt", "b.txt"]
+
+
+def test_open_entry_keeps_previous_directory_when_listing_fails(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    (tmp_path / "locked").mkdir()
+    manager = FileManager(tmp_path, tmp_path)
+    manager.refresh()
+    pane = manager.panes[0]
+    pane.cursor = 1
+    real_scandir = os.scandir
+
+    def scandir(path: Path) -> object:
+        if Path(path).name == "locked":
+            raise PermissionError(13, "Permission denied", str(path))
+        return real_scandir(path)
+
+    monkeypatch.setattr(os, "scandir", scandir)
+
+    with pytest.raises(PermissionError):
+        manager.open_entry(tmp_path / "locked")
+
+    assert pane.path == tmp_path
+    assert pane.cursor == 1
+    assert [entry.name for entry in pane.entries] == ["..", "locked"]